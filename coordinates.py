@@ -1,8 +1,9 @@
 from collections import namedtuple
 from itertools import product
+from functools import lru_cache
 import math
 
-from misc import match, sequence_getitem
+from misc import match
 
 def coordtuple(name, axes):
     """Create a namedtuple which verifies that it is a valid coordinate.
@@ -14,32 +15,77 @@ def coordtuple(name, axes):
     Instances can also be used with the - operator (returns a new coordinate
     where all components are negated) and the abs() functions (does the same
     but all components are absolute valued).
+
+    There is a single instance of each valid coordinate, the results of
+    - and abs() are looked up in tables, and the results of distance are
+    cached.
     """
 
     fields = [axis.symbol for axis in axes]
 
-    class T(namedtuple(name, fields)):
-        def __new__(cls, *args):
-            for axis, component in zip(axes, args):
-                if component not in axis:
-                    raise ValueError()
+    if len(axes) == 2:
+        # fast path for the common 2D case - avoids building a
+        # generator for every distance computation
+        def sequence_distance(a, b):
+            d0 = a[0] - b[0]
+            d1 = a[1] - b[1]
+            return math.sqrt(d0 * d0 + d1 * d1)
+    else:
+        def sequence_distance(a, b):
+            return math.sqrt(sum((x - y)**2 for x, y in zip(a, b)))
+
+    cached_distance = lru_cache(maxsize=None)(sequence_distance)
 
-            return super(T, cls).__new__(cls, *args)
+    instances = {}
+    abs_table = {}
+    neg_table = {}
 
-        def _map_vals(self, func):
-            return T(*map(func, self))
+    class T(namedtuple(name, fields)):
+        # no per-instance __dict__, like the namedtuple itself
+        __slots__ = ()
+
+        def __new__(cls, *args):
+            # instances holds every valid coordinate
+            try:
+                return instances[args]
+            except KeyError:
+                raise ValueError() from None
 
+        # the tables only leave out results that aren't on the axes
         def __abs__(self):
-            return self._map_vals(lambda val: abs(val))
+            try:
+                return abs_table[self]
+            except KeyError:
+                raise ValueError() from None
 
         def __neg__(self):
-            return self._map_vals(lambda val: -val)
+            try:
+                return neg_table[self]
+            except KeyError:
+                raise ValueError() from None
 
         def distance(self, other):
-            return math.sqrt(sum((a - b)**2 for a, b in zip(self, other)))
+            # other may be any sequence, but only Coords are cached
+            if isinstance(other, T):
+                return cached_distance(self, other)
+
+            return sequence_distance(self, other)
 
     T.__name__ = name
 
+    base_new = super(T, T).__new__
+    for components in product(*axes):
+        instances[components] = base_new(T, *components)
+
+    for components, coord in instances.items():
+        abs_components = tuple(abs(val) for val in components)
+        if abs_components in instances:
+            abs_table[coord] = instances[abs_components]
+
+        neg_components = tuple(-val for val in components)
+        if neg_components in instances:
+            neg_table[coord] = instances[neg_components]
+
     return T
 
 class CenteredOriginAxis:
@@ -60,56 +106,35 @@ class CenteredOriginAxis:
         self.symbol = symbol
         self.num_vals = num_vals
 
+        # the values on the axis in order, and the index of each value
+        abs_max = num_vals // 2
+        self._values = tuple(val for val in range(-abs_max, abs_max + 1)
+                                 if val != 0 or num_vals % 2 != 0)
+        self._indices = {val: i for i, val in enumerate(self._values)}
+
     def __len__(self):
         return self.num_vals
 
-    @sequence_getitem
-    def __getitem__(self, i):
-        if not 0 <= i < self.num_vals:
-            raise IndexError()
-
-        abs_max = self.num_vals // 2
-
-        if i < abs_max:
-            return -abs_max + i
-
-        i -= abs_max
+    def __getitem__(self, key):
+        # the values tuple already handles negative indices and slices
+        if isinstance(key, slice):
+            return list(self._values[key])
 
-        if 0 in self:
-            if i == 0:
-                return 0
+        return self._values[key]
 
-            i -= 1
-
-        if i < abs_max:
-            return i + 1
+    def __iter__(self):
+        return iter(self._values)
 
     def __contains__(self, val):
-        if val == 0:
-            return self.num_vals % 2 != 0
-
-        abs_max = self.num_vals // 2
-
-        return val in range(-abs_max, abs_max + 1)
+        return val in self._indices
 
     def index(self, val):
         """Return the index of val in this axis."""
 
-        if val not in self:
-            raise ValueError()
-
-        abs_max = self.num_vals // 2
-
-        if val == 0:
-            return abs_max
-        elif val < 0:
-            return abs_max + val
-        else:
-            ret = abs_max + val
-            if 0 not in self:
-                ret -= 1
-
-            return ret
+        try:
+            return self._indices[val]
+        except KeyError:
+            raise ValueError() from None
 
     def match(self, matchval):
         """Return the values in the axis that match the given matchval.
@@ -163,6 +188,11 @@ class CoordinateSystem:
 
         self.Coord = coordtuple('Coord', axes)
 
+        # every coordinate on the system, in the order coords_matching
+        # produces them
+        self.coords = tuple(self.Coord(*components)
+                            for components in product(*axes))
+
         for axis in axes:
             setattr(self, axis.symbol, axis)
 
@@ -178,6 +208,11 @@ class CoordinateSystem:
         matches the cooresponding component in the coordinate.
         """
 
+        # matching everything is by far the most common case
+        if (len(spec) == len(self.axes) and
+            all(axis_range == '*' for axis_range in spec)):
+            return iter(self.coords)
+
         matches = (axis.match(axis_range)
                    for axis, axis_range in zip(self.axes, spec))
 
@@ -242,10 +277,7 @@ class CoordinateSystemState:
     def __init__(self, system):
         self.system = system
 
-        self.state = {
-            system.Coord(*components): None
-            for components in system.coords_matching('*', '*')
-        }
+        self.state = dict.fromkeys(system.coords)
 
     def __getitem__(self, position):
         return self.state[position]
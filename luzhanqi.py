@@ -1,6 +1,6 @@
-from collections import namedtuple, defaultdict
+from collections import namedtuple
 from itertools import product
-from functools import reduce
+from functools import lru_cache
 import logging
 
 from misc import (namedtuple_with_defaults, match_sequence,
@@ -105,6 +105,9 @@ class BoardPiece:
     if we don't actually know what type of piece it is.
     """
 
+    __slots__ = ('events', 'movements', 'attacks', 'spec', 'maybies',
+                 '_dead', '_position')
+
     def __init__(self, spec=None):
         """Initialize a BoardPiece with an optional piece type."""
 
@@ -114,6 +117,10 @@ class BoardPiece:
         self.spec = spec
         self.maybies = None
 
+        # kept up to date by add_event
+        self._dead = False
+        self._position = None
+
         if not spec:
             self.maybies = LuzhanqiBoard.pieces.copy()
 
@@ -160,7 +167,11 @@ class BoardPiece:
         return True
 
     def add_event(self, event):
-        """Add the given event to this piece's event history."""
+        """Add the given event to this piece's event history.
+
+        Returns the position where the piece died if the event killed it,
+        or None if the piece is still alive.
+        """
 
         if self.dead:
             raise RuntimeError('This piece is dead - nothing further '
@@ -168,6 +179,7 @@ class BoardPiece:
 
         if event.piece is self:
             self.movements.append(event)
+            self._position = event.end
         elif event.attack is not None and event.attack.piece is self:
             if event.attack.theoretical:
                 raise RuntimeError('A theoretical attack cannot be an event!')
@@ -186,6 +198,18 @@ class BoardPiece:
 
             self.maybies -= to_remove
 
+        if not self._fatal_event(event):
+            return None
+
+        self._dead = True
+        self._position = None
+
+        # see died_at
+        if event.piece is self:
+            return event.start
+        else:
+            return event.end
+
     def force_inference(self, spec):
         """Allows specifying that an opponent's piece is definitely a certain
         type of piece.
@@ -225,10 +249,7 @@ class BoardPiece:
     def dead(self):
         """Determine whether this piece is dead or not."""
 
-        if len(self.events) == 0:
-            return False
-
-        return bool(self._fatal_event(self.events[-1]))
+        return self._dead
 
     @property
     def position(self):
@@ -237,10 +258,7 @@ class BoardPiece:
         Returns None if the piece is dead or has not yet been placed.
         """
 
-        if self.dead or not self.initial:
-            return None
-
-        return self.movements[-1].end
+        return self._position
 
     @property
     def died_at(self):
@@ -275,12 +293,20 @@ class LuzhanqiBoard:
                               CenteredOriginAxis('y', 12))
     Coord = system.Coord
 
-    board_spec = defaultdict(lambda: LuzhanqiBoard.STATION, {
+    # the spaces in one quadrant of the board (by absolute position) that
+    # aren't soldier stations
+    board_spec = {
         Coord(1, 2): CAMP,
         Coord(0, 3): CAMP,
         Coord(1, 4): CAMP,
         Coord(1, 6): HEADQUARTERS
-    })
+    }
+
+    # the space at every position on the board
+    position_specs = {}
+    for position in system.coords:
+        position_specs[position] = board_spec.get(abs(position), STATION)
+    del position
 
     # initial_counts should add up to 25
     MARSHAL = Piece('Field Marshal', '9', 1, order=9,
@@ -369,7 +395,9 @@ class LuzhanqiBoard:
     def position_spec(cls, position):
         """Get the Space object that corresponds to the given position."""
 
-        return cls.board_spec[abs(position)]
+        return cls.position_specs[position]
+
+    _positions_matching_cache = {}
 
     @classmethod
     def position_match(cls, position, matchval):
@@ -379,32 +407,68 @@ class LuzhanqiBoard:
         on the Space object at the given position.
         """
 
+        return position in cls.positions_matching(matchval)
+
+    @classmethod
+    def positions_matching(cls, matchval):
+        """Return a frozenset of the positions that match a given matchval.
+
+        See position_match. The result is cached if the matchval is
+        hashable.
+        """
+
+        cache = cls._positions_matching_cache
+        try:
+            return cache[matchval]
+        except KeyError:
+            hashable = True
+        except TypeError:
+            hashable = False
+
         if isinstance(matchval, Space):
-            return cls.position_spec(position) == matchval
+            matches = lambda position: cls.position_spec(position) == matchval
         else:
-            return match_sequence(position, matchval)
+            matches = lambda position: match_sequence(position, matchval)
+
+        positions = frozenset(position for position in cls.system.coords
+                                       if matches(position))
+
+        if hashable:
+            cache[matchval] = positions
+
+        return positions
 
     @classmethod
+    @lru_cache(maxsize=None)
     def initial_positions(cls):
-        """Return the initial placement positions for a player."""
+        """Return the initial placement positions for a player.
 
-        nonneg = lambda i: i >= 0
+        The positions never change, so they are computed once and returned
+        as a tuple.
+        """
+
+        positions = []
+        for position in cls.system.coords:
+            if (position.x >= 0 and position.y > 0 and
+                cls.position_spec(position).initial_placement):
+                positions.append(position)
 
-        absolutes = (position
-                     for position in cls.system.coords_matching(nonneg, nonneg)
-                     if cls.position_spec(position).initial_placement)
+                if position.x != 0:
+                    positions.append(cls.Coord(-position.x, position.y))
 
-        x_map = lambda axis, x: axis.original_and_reflection(x)
-        return cls.system.map_coord_components(absolutes, x=x_map)
+        return tuple(positions)
 
     @classmethod
+    @lru_cache(maxsize=None)
     def initial_enemy_positions(cls):
-        """Return the initial placement positions for a player's opponent."""
+        """Return the initial placement positions for a player's opponent.
 
-        initials = cls.initial_positions()
+        These are the reflections of initial_positions across the x axis,
+        in the same order. Like initial_positions, this is computed once
+        and returned as a tuple.
+        """
 
-        y_reflect = lambda axis, y: axis.reflection(y)
-        return cls.system.map_coord_components(initials, y=y_reflect)
+        return tuple(cls.Coord(x, -y) for x, y in cls.initial_positions())
 
     @classmethod
     def can_move(cls, piece):
@@ -473,11 +537,14 @@ class LuzhanqiBoard:
                 else:
                     all_marks[position] = mark
 
-        col_widths = [reduce(max,
-                             (len(mark) for position, mark in all_marks.items()
-                                        if position.x == col),
-                             len(str(col)))
-                      for col in cls.system.x]
+        # bucket the marks by row and find the column widths
+        widths = {col: len(str(col)) for col in cls.system.x}
+        marks_by_row = {}
+        for (x, y), mark in all_marks.items():
+            widths[x] = max(widths[x], len(mark))
+            marks_by_row.setdefault(y, {})[x] = mark
+
+        col_widths = [widths[col] for col in cls.system.x]
         horizontal_pad_size = 2
         horizontal_pad = ' ' * horizontal_pad_size
 
@@ -504,38 +571,36 @@ class LuzhanqiBoard:
 
             line += edge
 
-            logging.log(level, line)
-
-        def pad_vertical():
-            for _ in range(vertical_pad_size):
-                grid_line()
+            return line
 
-        def sep_line():
-            grid_line(edge='+', sep='+', dashes=True)
+        sep_line = grid_line(edge='+', sep='+', dashes=True)
+        pad_lines = [grid_line()] * vertical_pad_size
 
-        grid_line(edge=' ', sep=' ', marks={x: x for x in cls.system.x})
+        lines = [grid_line(edge=' ', sep=' ',
+                           marks={x: x for x in cls.system.x})]
 
         for row in cls.system.y:
-            sep_line()
-            pad_vertical()
+            lines.append(sep_line)
+            lines.extend(pad_lines)
 
-            pieces = {x: mark for (x, y), mark in all_marks.items()
-                              if y == row}
+            lines.append(grid_line(row=row, marks=marks_by_row.get(row, {})))
 
-            grid_line(row=row, marks=pieces)
+            lines.extend(pad_lines)
 
-            pad_vertical()
+        lines.append(sep_line)
 
-        sep_line()
+        # log the whole board as a single record
+        logging.log(level, '\n'.join(lines))
 
     def __init__(self):
         self.board = CoordinateSystemState(self.system)
 
-        self.friendly_pieces = set()
-        self.friendly_pieces_dead = set()
+        # lists, so that the pieces are iterated in a stable order
+        self.friendly_pieces = []
+        self.friendly_pieces_dead = []
 
-        self.enemy_pieces = set()
-        self.enemy_pieces_dead = set()
+        self.enemy_pieces = []
+        self.enemy_pieces_dead = []
 
         self.turn = 0
 
@@ -708,14 +773,12 @@ class LuzhanqiBoard:
 
         for piece in self._placement_order(placement_order):
             placement = piece.initial_placement
-            choices = positions
 
-            if placement is not None:
-                choices = (position
-                           for position in positions
-                           if self.position_match(position, placement))
+            if placement is None:
+                choices = set(positions)
+            else:
+                choices = positions & self.positions_matching(placement)
 
-            choices = set(choices)
             if len(choices) < piece.initial_count:
                 raise RuntimeError("Not enough choices to place piece!")
 
@@ -726,7 +789,7 @@ class LuzhanqiBoard:
 
                 new_piece = BoardPiece(piece)
                 new_piece.add_event(Movement(self, new_piece, choice))
-                self.friendly_pieces.add(new_piece)
+                self.friendly_pieces.append(new_piece)
                 self.board[choice] = new_piece
 
     def setup(self, placement_order, get_placements):
@@ -751,7 +814,7 @@ class LuzhanqiBoard:
         for position in self.initial_enemy_positions():
             new_piece = BoardPiece()
             new_piece.add_event(Movement(self, new_piece, position))
-            self.enemy_pieces.add(new_piece)
+            self.enemy_pieces.append(new_piece)
             self.board[position] = new_piece
 
         self.turn = 1
@@ -764,12 +827,12 @@ class LuzhanqiBoard:
                yield move
 
     def get_living_pieces(self):
-        """Returns the set of our pieces that are still alive."""
+        """Returns the list of our pieces that are still alive."""
 
         return self.friendly_pieces
 
     def get_living_enemy_pieces(self):
-        """Returns the set of enemy pieces that are still alive."""
+        """Returns the list of enemy pieces that are still alive."""
 
         return self.enemy_pieces
 
@@ -778,21 +841,21 @@ class LuzhanqiBoard:
 
         return self.board[position]
 
-    def _check_pulse(self, piece):
-        if not piece.dead:
+    def _retire_if_dead(self, piece, died_at):
+        if died_at is None:
             return
 
-        self.board[piece.died_at] = None
+        self.board[died_at] = None
 
         if piece.friendly:
-            living_set = self.friendly_pieces
-            dead_set = self.friendly_pieces_dead
+            living = self.friendly_pieces
+            dead = self.friendly_pieces_dead
         else:
-            living_set = self.enemy_pieces
-            dead_set = self.enemy_pieces_dead
+            living = self.enemy_pieces
+            dead = self.enemy_pieces_dead
 
-        living_set.remove(piece)
-        dead_set.add(piece)
+        living.remove(piece)
+        dead.append(piece)
 
     def _move_on_board(self, movement):
         if self.board[movement.end] is not None:
@@ -807,29 +870,32 @@ class LuzhanqiBoard:
         moved = movement.piece
         attacked = movement.attack.piece if movement.attack else None
 
-        moved.add_event(movement)
+        moved_died_at = moved.add_event(movement)
 
         if attacked is not None:
-            attacked.add_event(movement)
+            attacked_died_at = attacked.add_event(movement)
 
-            self._check_pulse(moved)
-            self._check_pulse(attacked)
+            self._retire_if_dead(moved, moved_died_at)
+            self._retire_if_dead(attacked, attacked_died_at)
 
-        if not moved.dead:
+        if moved_died_at is None:
             self._move_on_board(movement)
 
         self.turn += 1
 
     def _layout_markers(self):
         return {piece.position: str(piece)
-                for piece in self.friendly_pieces | self.enemy_pieces}
+                for piece in self.friendly_pieces + self.enemy_pieces}
 
     def log_board_layout(self, level=logging.DEBUG):
         """Log the board layout with the given log level or DEBUG."""
 
+        # don't stringify every piece if nothing is going to be logged
+        if not logging.getLogger().isEnabledFor(level):
+            return
+
         self.log_board_with_markers(self._layout_markers(), level=level)
 
     def log_defeated_pieces(self):
         for piece in self.enemy_pieces_dead:
-            logging.debug('{} ({}): {}'.format(piece.initial, piece.died_at,
-                                               piece))
+            logging.debug('%s (%s): %s', piece.initial, piece.died_at, piece)
@@ -1,5 +1,4 @@
-from collections import namedtuple, deque
-from itertools import count
+from collections import namedtuple, deque, OrderedDict
 
 def namedtuple_with_defaults(typename, *args, **kwargs):
     """Like namedtuple, but allows specifying defaults.
@@ -9,19 +8,18 @@ def namedtuple_with_defaults(typename, *args, **kwargs):
     are specified as keyword arguments.
     """
 
-    extra_args = {}
-    for arg in 'verbose', 'rename':
-        if arg in kwargs:
-            extra_args[arg] = kwargs[arg]
-            del kwargs[arg]
+    extra_args = {arg: kwargs.pop(arg)
+                  for arg in ('verbose', 'rename') if arg in kwargs}
 
-    kwargs = tuple(kwargs.items())
-    field_names = list(args) + [key for key, val in kwargs]
-    defaults = tuple(val for key, val in kwargs)
+    # keyword arguments keep their order, so the defaults line up with
+    # the trailing field names
+    return namedtuple(typename, list(args) + list(kwargs),
+                      defaults=tuple(kwargs.values()), **extra_args)
 
-    T = namedtuple(typename, field_names, **extra_args)
-    T.__new__.__defaults__ = defaults
-    return T
+_WILDCARD = '*'
+
+# Container types that match can use the "in" operator with directly.
+_CONTAINER_TYPES = (tuple, list, set, frozenset, range)
 
 def match(val, matchval):
     """Do a generic value match between a value and a "matchval".
@@ -35,10 +33,12 @@ def match(val, matchval):
         equality.
     """
 
-    if matchval == '*':
+    if matchval == _WILDCARD:
         return True
     elif callable(matchval):
         return matchval(val)
+    elif isinstance(matchval, _CONTAINER_TYPES):
+        return val in matchval
 
     try:
         return val in matchval
@@ -47,39 +47,20 @@ def match(val, matchval):
 
     return val == matchval
 
-def match_sequence(seq, matchvals):
+def match_sequence(seq, matchvals, _match=match):
     """Apply a sequence of matchvals to a sequence of values.
 
     See match.
     """
 
-    return (len(seq) == len(matchvals) and
-            all(match(val, matchval)
-                for val, matchval in zip(seq, matchvals)))
-
-def sequence_getitem(getitem):
-    """Decorates sequence __getitem__ methods and adds slicing and negatives.
-
-    Slicing allows getting a range of values with an optional step. Negative
-    indeces allows getting values from the end of the sequence. These things
-    are both annoying to implement and can be implemented with common code,
-    which is what this decorator does.
-    """
-
-    def new_getitem(self, key):
-        if isinstance(key, int):
-            if -len(self) <= key <= -1:
-                key = len(self) + key
-            elif key < 0:
-                raise IndexError()
+    if len(seq) != len(matchvals):
+        return False
 
-            return getitem(self, key)
-        elif isinstance(key, slice):
-            return [self[i] for i in range(*key.indices(len(self)))]
-        else:
-            raise TypeError()
+    for val, matchval in zip(seq, matchvals):
+        if not _match(val, matchval):
+            return False
 
-    return new_getitem
+    return True
 
 def find_connected_component(vertex, label, f):
     """Given a function, an initial vertex, and its label, uses the function
@@ -93,37 +74,64 @@ def find_connected_component(vertex, label, f):
     """
 
     explored = {vertex: label}
-    frontier = deque(explored)
+    frontier = deque([(vertex, label)])
 
-    while len(frontier) > 0:
-        cur = frontier.popleft()
-        cur_label = explored[cur]
+    while frontier:
+        cur, cur_label = frontier.popleft()
 
         for adj, adj_label in f(cur, cur_label):
             if adj not in explored:
-                frontier.append(adj)
                 explored[adj] = adj_label
+                frontier.append((adj, adj_label))
 
     return explored
 
-def memoize_generator(g):
-    cache = {}
+def memoize_generator(g=None, *, maxsize=None):
+    """Decorates a generator function so that its values are cached.
 
-    def wrapper(*args):
-        args = tuple(args)
+    The values produced for a given set of arguments are stored as they
+    are generated, and later calls with the same arguments replay them
+    (continuing the original generator if it hasn't been exhausted yet).
+    The arguments must be hashable.
 
+    This can be used either directly as a decorator or as
+    memoize_generator(maxsize=n), in which case at most n sets of
+    arguments are cached and the least recently used one is evicted.
+    """
+
+    if g is None:
+        return lambda g: memoize_generator(g, maxsize=maxsize)
+
+    cache = OrderedDict()
+
+    def wrapper(*args):
         try:
-            iterator, l = cache[args]
+            iterator, values = cache[args]
+
+            if maxsize is not None:
+                cache.move_to_end(args)
         except KeyError:
             iterator = g(*args)
-            l = []
-            cache[args] = iterator, l
-
-        for i in count():
-            if i == len(l):
-                l.append(next(iterator))
-
-            yield l[i]
+            values = []
+            cache[args] = iterator, values
+
+            if maxsize is not None and len(cache) > maxsize:
+                cache.popitem(last=False)
+
+        i = 0
+        while True:
+            if i < len(values):
+                yield values[i]
+            else:
+                try:
+                    value = next(iterator)
+                except StopIteration:
+                    return
+
+                values.append(value)
+                yield value
+
+            i += 1
 
     return wrapper
 
@@ -1,22 +1,21 @@
 #! /usr/bin/python3
 
-import cProfile
 import os
 
-import traceback
 import argparse
 import logging
 import atexit
 import random
 import time
 import sys
-import re
+
+from collections import defaultdict
 
 from luzhanqi import LuzhanqiBoard, Movement
 
-# Time Regex: ^(\d+)(?:\.(\d+))?(s|ms)$
-# Starts with one or more digits. May be followed by a decimal point ('.')
-# and one or more digits. Must end with a unit ('s'/'ms').
+# Time units: 'ms' is checked before 's' since it also ends with 's'
+time_units = ('ms', 's')
+
 def valid_time(time):
     """
     Parses the time/move command line argument to make sure it passes a
@@ -26,15 +25,24 @@ def valid_time(time):
         2000ms
         2000.0ms
 
+    That is, one or more digits, optionally followed by a decimal point
+    ('.') and one or more digits, and ending with a unit ('s'/'ms').
+
     Passing an invalid time format will result in an ArgumentTypeError.
     Passing a correct format will return the time string.
 
     """
-    p = re.compile('^(\d+)(?:\.(\d+))?(s|ms)$')
-    if p.match(time):
-        return time
-    else:
-        raise argparse.ArgumentTypeError('is not a correct format')
+    for unit in time_units:
+        if time.endswith(unit):
+            whole, point, fraction = time[:-len(unit)].partition('.')
+
+            if (whole.isdecimal() and
+                (fraction.isdecimal() or not point)):
+                return time
+
+            break
+
+    raise argparse.ArgumentTypeError('is not a correct format')
 
 
 def init_argparser():
@@ -73,6 +81,14 @@ def init_argparser():
 # Stuff for dealing with the message syntax for coordinates
 system = LuzhanqiBoard.system
 
+# The message syntax string for every coordinate, and the reverse mapping
+coord_strings = {
+    system.Coord(x, y): chr(ord('A') + i) + str(len(system.y) - j)
+    for i, x in enumerate(system.x)
+    for j, y in enumerate(system.y)
+}
+coords_by_string = {string: coord for coord, string in coord_strings.items()}
+
 def stringify_coord(self):
     """Stringify a Coord object as defined by the message syntax.
 
@@ -82,64 +98,94 @@ def stringify_coord(self):
     Examples: A1, E12, B7, C3, etc
     """
 
-    xstr = chr(ord('A') + system.x.index(self.x))
-    ystr = str(len(system.y) - system.y.index(self.y))
-
-    return xstr + ystr
+    return coord_strings[self]
 
 # Monkey-patch automatic stringification into Coord
 system.Coord.__str__ = stringify_coord
 
-coord_regex = re.compile('^([A-E])(\d{1,2})$')
+# Positions that get_good_moves and the placement functions aim for
+enemy_front_lines = frozenset({
+    system.Coord(-2, -1),
+    system.Coord(0, -1),
+    system.Coord(2, -1)
+})
+
+headquarters = (system.Coord(-1, 6), system.Coord(1, 6))
+
+# For each headquarters the flag could be in: the position in front of it,
+# and the positions on either side of it
+landmine_placements = {
+    hq: (system.Coord(hq.x, hq.y - 1),
+         frozenset({system.Coord(hq.x + 1, hq.y),
+                    system.Coord(hq.x - 1, hq.y)}))
+    for hq in headquarters
+}
+
+bomb_placements = frozenset({system.Coord(-2, 4), system.Coord(2, 4)})
 
 def parse_coord(coord):
     """Form a Coord object from a message syntax representation of a
     coordinate.
 
-    See stringify_coord for a description of the syntax.
+    See stringify_coord for a description of the syntax. None is returned
+    if the string isn't a coordinate on the board.
+    """
+
+    return coords_by_string.get(coord)
+
+# Stuff for dealing with the message syntax for movements
+outcomes = {'move', 'win', 'loss', 'tie'}
+
+def parse_move_message(message):
+    """Split a move message into its parts.
+
+    The syntax used by the referee for moves consists of four
+    elements, separated by whitespace: the first two elements
+    are coordinates (see above), the third is a player number,
+    and the fourth is a move outcome which shall be one of
+    move, win, loss, or tie.
+
+    Returns a tuple of the start and end Coords, the player number,
+    and the outcome string, or None if the string isn't a valid move
+    message.
     """
 
-    coord_match = coord_regex.match(coord)
+    parts = message.split()
 
-    if coord_match is None:
+    if len(parts) != 4:
         return None
 
-    x, y = coord_match.group(1, 2)
+    start, end, player, outcome = parts
 
-    x = system.x[ord(x) - ord('A')]
-    y = system.y[-int(y)]
+    if (outcome not in outcomes or
+        len(player) != 1 or not '0' <= player <= '9'):
+        return None
 
-    return system.Coord(x, y)
+    start = parse_coord(start)
+    end = parse_coord(end)
 
-# Stuff for dealing with the message syntax for movements
-movement_re = re.compile('^\s*(\w+)\s+(\w+)\s+(\d)\s+'
-                         '(move|win|loss|tie)\s*$')
+    if start is None or end is None:
+        return None
+
+    return start, end, int(player), outcome
 
 def parse_movement(board, move):
     """Form a Movement object from a message syntax representation of a move.
 
-    This function accepts a LuzhanqiBoard object and a
-    string containing information about a move. The string
-    shall use the syntax that the referee uses when
-    communicating moves to the players. This syntax consists
-    of four elements, separated by whitespace: the first two
-    elements are coordinates (see above), the third is a
-    player number, and the fourth is a move outcome which
-    shall be one of move, win, loss, or tie.
+    This function accepts a LuzhanqiBoard object and a string
+    containing a move message (see parse_move_message).
 
     For the purposes of this function, the player value is
-    ignored. The corresponding Movement object is returned.
+    ignored. The corresponding Movement object is returned, or
+    None if the string isn't a valid move message.
     """
 
-    move_match = movement_re.match(move)
+    parsed = parse_move_message(move)
 
-    if move_match is None:
+    if parsed is None:
         return None
 
-    start, end, player, outcome = move_match.group(1, 2, 3, 4)
-    start = parse_coord(start)
-    end = parse_coord(end)
-    player = int(player)
+    start, end, _, outcome = parsed
 
     if outcome == 'move':
         outcome = None
@@ -150,21 +196,17 @@ def parse_movement(board, move):
 
     return Movement(board, piece, end, outcome)
 
-invalid_move = re.compile('^\s*Invalid\s+Board\s+Move\s+(.*?)\s*$')
-flag_pos = re.compile('^\s*F\s+(\w+)\s*$')
-victory = re.compile('^\s*(1|2|No)\s+Victory\s*$')
-
 def write(message):
     """Send a message to the referee.
 
-    This function also takes care of output flushing and logging.
+    This function also takes care of logging. Output is flushed because
+    main makes stdout line buffered.
     """
 
     message = str(message)
-    print(message)
-    sys.stdout.flush()
+    sys.stdout.write(message + '\n')
 
-    logging.info('sent: "' + message + '"')
+    logging.info('sent: "%s"', message)
 
 def receive_message(game):
     """Receive messages from the referee until a move message is received.
@@ -181,33 +223,22 @@ def receive_message(game):
     - 1, 2, or No Victory
         Sent when the game is over and a player has won or
         there was a tie.
+
+    EOFError is raised if stdin is closed.
     """
 
     marshal_died = False
 
     while True:
-        message = input()
+        message = sys.stdin.readline()
+        if not message:
+            raise EOFError()
 
-        logging.info('received: "' + message + '"')
+        message = message.rstrip('\n')
 
-        if invalid_move.match(message):
-            raise RuntimeError(message)
-
-        if victory.match(message):
-            sys.exit()
-
-        match = flag_pos.match(message)
-        if match:
-            coord = parse_coord(match.group(1))
-
-            # the referee sends F messages to us about our own
-            # flag - we need to ignore those
-            if coord.y < 0:
-                game.get(coord).force_inference(game.FLAG)
-                marshal_died = True
-
-            continue
+        logging.info('received: "%s"', message)
 
+        # moves are by far the most common message, so try them first
         move = parse_movement(game, message)
         if move is not None:
             game.add_move(move)
@@ -223,31 +254,54 @@ def receive_message(game):
 
             return
 
-        logging.error('parsing failed for "' + message + '"')
+        # the other kinds of messages can be told apart by their words
+        words = message.split()
+
+        if words[:3] == ['Invalid', 'Board', 'Move']:
+            raise RuntimeError(message)
+
+        if (len(words) == 2 and words[1] == 'Victory' and
+            words[0] in ('1', '2', 'No')):
+            sys.exit()
+
+        coord = None
+        if len(words) == 2 and words[0] == 'F':
+            coord = parse_coord(words[1])
+
+        if coord is None:
+            logging.error('parsing failed for "%s"', message)
+            continue
+
+        # the referee sends F messages to us about our own
+        # flag - we need to ignore those
+        if coord.y < 0:
+            game.get(coord).force_inference(game.FLAG)
+            marshal_died = True
 
 def get_good_moves(game, moves):
-    moves_by_piece = {}
+    # bombs either get to safety or attack something, which short-circuits
+    # everything else, so deal with them before grouping the other moves
+    bomb_moves_by_piece = defaultdict(list)
     for move in moves:
-        moves_by_piece.setdefault(move.piece, set()).add(move)
+        if move.piece.spec == game.BOMB:
+            bomb_moves_by_piece[move.piece].append(move)
 
-    for piece, moves in moves_by_piece.items():
-        if piece.spec == game.BOMB:
-            if not game.position_spec(piece.position).safe:
-                for move in moves:
-                    if game.position_spec(move.end).safe:
-                        return {move}
-
-            for move in moves:
-                if move.attack:
+    for piece, bomb_moves in bomb_moves_by_piece.items():
+        if not game.position_spec(piece.position).safe:
+            for move in bomb_moves:
+                if game.position_spec(move.end).safe:
                     return {move}
 
-    good_moves = set()
+        for move in bomb_moves:
+            if move.attack:
+                return {move}
 
-    enemy_front_lines = {
-        game.Coord(-2, -1),
-        game.Coord(0, -1),
-        game.Coord(2, -1)
-    }
+    moves_by_piece = defaultdict(list)
+    for move in moves:
+        if move.piece.spec != game.BOMB:
+            moves_by_piece[move.piece].append(move)
+
+    good_moves = set()
 
     maybe_flags = set()
     for piece in game.get_living_enemy_pieces():
@@ -262,29 +316,21 @@ def get_good_moves(game, moves):
     maybe_flags = {piece.position for piece in maybe_flags}
 
     for piece, moves in moves_by_piece.items():
-        if piece.spec == game.BOMB:
-            continue
-
-        def end_distance_to(to):
-            return lambda m: to.distance(m.end)
+        position = piece.position
 
-        closest_flag = sorted(maybe_flags,
-                              key=piece.position.distance)[0]
-        best_flag_move = sorted(moves,
-                                key=end_distance_to(closest_flag))[0]
+        closest_flag = min(maybe_flags, key=position.distance)
+        best_flag_move = min(moves,
+                             key=lambda m: closest_flag.distance(m.end))
         if (best_flag_move.end.distance(closest_flag) <
             best_flag_move.start.distance(closest_flag)):
             good_moves.add(best_flag_move)
         else:
-            if piece.position.y < 0:
+            if position.y < 0:
                 continue
 
-            closest_front_line = sorted(enemy_front_lines,
-                                        key=piece.position.distance)[0]
-            best_front_line_move = sorted(moves,
-                                          key=end_distance_to(
-                                                  closest_front_line
-                                              ))[0]
+            closest_front_line = min(enemy_front_lines, key=position.distance)
+            best_front_line_move = min(
+                moves, key=lambda m: closest_front_line.distance(m.end))
 
             if (best_front_line_move.end.distance(closest_front_line) <
                 best_front_line_move.start.distance(closest_front_line)):
@@ -318,16 +364,16 @@ def do_move(game, rng):
     referee that tells us the outcome of the move.
     """
 
-    moves = set(game.valid_moves())
+    moves = list(game.valid_moves())
     good_moves = get_good_moves(game, moves)
     if len(good_moves) > 0:
-        moves = good_moves
+        moves = list(good_moves)
 
     if len(moves) == 0:
         write('forfeit')
         return
 
-    move = rng.sample(moves, 1)[0]
+    move = rng.choice(moves)
     write('({0} {1})'.format(move.start, move.end))
 
     receive_message(game)
@@ -337,6 +383,9 @@ def main():
     player, timelimit = init_argparser()
     game = None
 
+    # the referee needs to see each message as soon as it's written
+    sys.stdout.reconfigure(line_buffering=True)
+
     log_level = os.environ.get('PLAY4500_LOGGING', None)
     if log_level is not None:
         logging.basicConfig(filename='log.{0}.txt'.format(player),
@@ -364,7 +413,7 @@ def main():
     else:
         rand_seed = int(time.time())
 
-    logging.info('Random seed: ' + str(rand_seed))
+    logging.info('Random seed: %s', rand_seed)
     rng = random.Random(rand_seed)
 
     placement_order = [LuzhanqiBoard.FLAG,
@@ -376,36 +425,40 @@ def main():
             if LuzhanqiBoard.position_spec(choice).quagmire:
                 return {choice}
 
-        for hq in [game.Coord(-1, 6), game.Coord(1, 6)]:
-            if game.get(hq).spec == game.FLAG:
-                flag_loc = hq
-                break
-
-        infront = game.Coord(flag_loc.x, flag_loc.y - 1)
+        infront, beside = landmine_placements[flag_position]
         if infront in choices:
             return {infront}
 
-        return choices & {game.Coord(flag_loc.x + 1, flag_loc.y),
-                          game.Coord(flag_loc.x - 1, flag_loc.y)}
+        return choices & beside
 
     def get_bomb_placements(choices):
-        return choices & {game.Coord(-2, 4), game.Coord(2, 4)}
+        return choices & bomb_placements
+
+    # the flag is placed first, so this is known by the time the
+    # landmines are placed
+    flag_position = None
 
     def get_placement(piece, choices):
+        nonlocal flag_position
+
         if piece == LuzhanqiBoard.LANDMINE:
             choices = good_landmine_placements(choices)
         elif piece == LuzhanqiBoard.BOMB:
             choices = get_bomb_placements(choices)
 
-        return rng.sample(choices, 1)[0]
+        position = rng.choice(tuple(choices))
+
+        if piece == LuzhanqiBoard.FLAG:
+            flag_position = position
+
+        return position
 
     game = LuzhanqiBoard()
     game.setup(placement_order, get_placement)
 
-    write('(' +
-          ' '.join('({0} {1})'.format(piece.initial, piece.spec.symbol)
-                   for piece in game.get_living_pieces()) +
-          ')')
+    placements = [f'({piece.initial} {piece.spec.symbol})'
+                  for piece in game.get_living_pieces()]
+    write(f"({' '.join(placements)})")
 
     if player == 1:
         do_move(game, rng)
@@ -416,6 +469,9 @@ def main():
 
 if __name__ == '__main__':
     if os.environ.get('PLAY4500_PROFILING', None) == '1':
+        # only pay for importing the profiler when it's actually used
+        import cProfile
+
         cProfile.run('main()', 'profile.{0}'.format(os.getpid()))
     else:
         main()
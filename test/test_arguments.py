@@ -13,13 +13,16 @@ class TestArguments(unittest.TestCase):
         times = ['2s', '2.0s', '3.456s',
                  '2000ms', '2000.0ms', '3000.456ms']
         for time in times:
-            self.assertEqual(valid_time(time), time)
+            with self.subTest(time=time):
+                self.assertEqual(valid_time(time), time)
 
     def test_invalid_times(self):
-        times = ['abc', '2', '3xyz', '4.$%ms']
+        times = ['abc', '2', '3xyz', '4.$%ms', '2s\n',
+                 's', 'ms', '.5s', '2.s', '1.2.3s', '2 ms']
         for time in times:
-            with self.assertRaises(argparse.ArgumentTypeError):
-                valid_time(time)
+            with self.subTest(time=time):
+                with self.assertRaises(argparse.ArgumentTypeError):
+                    valid_time(time)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import math
+
+from coordinates import CenteredOriginAxis, CoordinateSystem, coordtuple
+
+
+class TestCenteredOriginAxis(unittest.TestCase):
+
+    def test_odd_length(self):
+        axis = CenteredOriginAxis('x', 5)
+        self.assertEqual(list(axis), [-2, -1, 0, 1, 2])
+        self.assertIn(0, axis)
+        self.assertNotIn(3, axis)
+        self.assertEqual(axis.index(0), 2)
+        self.assertEqual(axis[-1], 2)
+
+    def test_even_length(self):
+        axis = CenteredOriginAxis('y', 12)
+        self.assertEqual(list(axis), [-6, -5, -4, -3, -2, -1,
+                                      1, 2, 3, 4, 5, 6])
+        self.assertNotIn(0, axis)
+        self.assertEqual(axis.index(1), 6)
+        self.assertEqual(axis[1:3], [-5, -4])
+
+    def test_out_of_range(self):
+        axis = CenteredOriginAxis('y', 12)
+        self.assertRaises(IndexError, lambda: axis[12])
+        self.assertRaises(ValueError, axis.index, 0)
+
+
+class TestCoordtuple(unittest.TestCase):
+
+    def setUp(self):
+        self.Coord = coordtuple('Coord', (CenteredOriginAxis('x', 5),
+                                          CenteredOriginAxis('y', 12)))
+
+    def test_interning(self):
+        self.assertIs(self.Coord(1, 2), self.Coord(1, 2))
+        self.assertEqual(self.Coord(1, 2), (1, 2))
+
+    def test_off_board(self):
+        for components in [(3, 1), (0, 0), (0, 7), (1,), (1, 2, 3)]:
+            with self.subTest(components=components):
+                with self.assertRaises(ValueError):
+                    self.Coord(*components)
+
+    def test_abs_and_neg(self):
+        for x in range(-2, 3):
+            for y in (-6, -1, 1, 6):
+                with self.subTest(x=x, y=y):
+                    coord = self.Coord(x, y)
+                    self.assertIs(abs(coord), self.Coord(abs(x), abs(y)))
+                    self.assertIs(-coord, self.Coord(-x, -y))
+
+    def test_distance(self):
+        self.assertEqual(self.Coord(1, 2).distance(self.Coord(-2, -2)), 5)
+        self.assertEqual(self.Coord(1, 2).distance([0, 0]), math.sqrt(5))
+        self.assertEqual(self.Coord(1, 2).distance((4, 6)), 5)
+
+
+class TestCoordinateSystem(unittest.TestCase):
+
+    def setUp(self):
+        self.system = CoordinateSystem(CenteredOriginAxis('x', 3),
+                                       CenteredOriginAxis('y', 2))
+
+    def test_coords_matching_wildcards(self):
+        everything = lambda val: True
+        self.assertEqual(list(self.system.coords_matching('*', '*')),
+                         list(self.system.coords_matching(everything,
+                                                          everything)))
+        self.assertEqual(len(list(self.system.coords_matching('*', '*'))), 6)
+
+    def test_coords_matching(self):
+        Coord = self.system.Coord
+        self.assertEqual(list(self.system.coords_matching(0, '*')),
+                         [Coord(0, -1), Coord(0, 1)])
+        self.assertEqual(list(self.system.coords_matching((-1, 1), 1)),
+                         [Coord(-1, 1), Coord(1, 1)])
+
+if __name__ == '__main__':
+    unittest.main()
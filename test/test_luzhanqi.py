@@ -0,0 +1,71 @@
+import unittest
+
+from luzhanqi import LuzhanqiBoard, BoardPiece, Movement
+
+
+class TestPositionMatch(unittest.TestCase):
+
+    def test_space(self):
+        Coord = LuzhanqiBoard.Coord
+        self.assertTrue(LuzhanqiBoard.position_match(
+            Coord(1, 6), LuzhanqiBoard.HEADQUARTERS))
+        self.assertFalse(LuzhanqiBoard.position_match(
+            Coord(0, 6), LuzhanqiBoard.HEADQUARTERS))
+
+    def test_unhashable_matchval(self):
+        Coord = LuzhanqiBoard.Coord
+        self.assertTrue(LuzhanqiBoard.position_match(Coord(0, 1),
+                                                     ('*', [1, 2])))
+        self.assertFalse(LuzhanqiBoard.position_match(Coord(0, 3),
+                                                      ('*', [1, 2])))
+
+
+class TestBoardPieceAddEvent(unittest.TestCase):
+
+    def setUp(self):
+        Coord = LuzhanqiBoard.Coord
+        self.board = LuzhanqiBoard()
+        self.friendly = BoardPiece(LuzhanqiBoard.COLONEL)
+        self.enemy = BoardPiece()
+        self.start, self.end = Coord(0, 1), Coord(0, -1)
+
+        for piece, position in ((self.friendly, self.start),
+                                (self.enemy, self.end)):
+            piece.add_event(Movement(self.board, piece, position))
+            self.board.board[position] = piece
+
+        self.board.turn = 1
+
+    def attack(self, outcome):
+        movement = Movement(self.board, self.friendly, self.end, outcome,
+                            {'ROAD'})
+        return (self.friendly.add_event(movement),
+                self.enemy.add_event(movement))
+
+    def test_move(self):
+        Coord = LuzhanqiBoard.Coord
+        movement = Movement(self.board, self.friendly, Coord(0, 2),
+                            move_types={'ROAD'})
+        self.assertIsNone(self.friendly.add_event(movement))
+        self.assertFalse(self.friendly.dead)
+        self.assertEqual(self.friendly.position, Coord(0, 2))
+
+    def test_attack_win(self):
+        self.assertEqual(self.attack('win'), (None, self.end))
+        self.assertEqual(self.friendly.position, self.end)
+        self.assertTrue(self.enemy.dead)
+        self.assertIsNone(self.enemy.position)
+
+    def test_attack_loss(self):
+        self.assertEqual(self.attack('loss'), (self.start, None))
+        self.assertTrue(self.friendly.dead)
+        self.assertIsNone(self.friendly.position)
+        self.assertEqual(self.enemy.position, self.end)
+
+    def test_tie(self):
+        self.assertEqual(self.attack('tie'), (self.start, self.end))
+        self.assertTrue(self.friendly.dead)
+        self.assertTrue(self.enemy.dead)
+
+if __name__ == '__main__':
+    unittest.main()
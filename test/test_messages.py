@@ -0,0 +1,28 @@
+import unittest
+
+from luzhanqi import LuzhanqiBoard
+from play4500 import parse_move_message
+
+
+class TestParseMoveMessage(unittest.TestCase):
+
+    def test_move(self):
+        Coord = LuzhanqiBoard.Coord
+        self.assertEqual(parse_move_message('C3 D3 1 move\n'),
+                         (Coord(0, 4), Coord(1, 4), 1, 'move'))
+
+    def test_not_a_move(self):
+        messages = ['F', 'C3 D3 1 jump', 'C3 Z9 1 win', 'C3 D3 x loss',
+                    'C3 D3 12 tie']
+        for message in messages:
+            with self.subTest(message=message):
+                self.assertIsNone(parse_move_message(message))
+
+    def test_wrong_number_of_fields(self):
+        messages = ['', 'C3 D3 1', 'C3 D3 1 move extra']
+        for message in messages:
+            with self.subTest(message=message):
+                self.assertIsNone(parse_move_message(message))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from misc import match, memoize_generator
+
+
+class TestMatch(unittest.TestCase):
+
+    def test_wildcard(self):
+        self.assertTrue(match(3, '*'))
+
+    def test_predicate(self):
+        self.assertTrue(match(3, lambda val: val > 2))
+        self.assertFalse(match(1, lambda val: val > 2))
+
+    def test_containers(self):
+        self.assertTrue(match(2, (1, 2)))
+        self.assertTrue(match(2, range(3)))
+        self.assertFalse(match(3, [1, 2]))
+
+    def test_other_containers(self):
+        self.assertTrue(match('a', 'abc'))
+        self.assertTrue(match(1, {1: 'a'}))
+        self.assertTrue(match(1, {1: 'a'}.keys()))
+
+    def test_equality(self):
+        self.assertTrue(match(3, 3))
+        self.assertFalse(match(3, 4))
+
+
+class TestMemoizeGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = 0
+
+    def counting_range(self, n):
+        self.calls += 1
+        yield from range(n)
+
+    def test_values_are_replayed(self):
+        g = memoize_generator(self.counting_range)
+        self.assertEqual(list(g(3)), [0, 1, 2])
+        self.assertEqual(list(g(3)), [0, 1, 2])
+        self.assertEqual(self.calls, 1)
+
+    def test_interleaved_iteration(self):
+        g = memoize_generator(self.counting_range)
+        a, b = g(3), g(3)
+        self.assertEqual([next(a), next(b), next(b), next(a)], [0, 0, 1, 1])
+        self.assertEqual(list(a), [2])
+        self.assertEqual(list(b), [2])
+
+    def test_maxsize(self):
+        g = memoize_generator(maxsize=1)(self.counting_range)
+        list(g(1))
+        list(g(2))
+        list(g(1))
+        self.assertEqual(self.calls, 3)
+
+if __name__ == '__main__':
+    unittest.main()